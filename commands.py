@@ -0,0 +1,49 @@
+def run_moving_averages(analyzer, visualizer, symbol, window=30):
+    """Calculate and plot SMA/EMA for a stock"""
+    print(f"\nCalculating Moving Averages for {symbol}...")
+    prices = analyzer.stocks[symbol].get_closing_prices()
+    sma = analyzer.calculate_sma(prices, window=window)
+    ema = analyzer.calculate_ema(prices, window=window)
+    visualizer.plot_moving_averages(symbol, prices, sma, ema)
+
+def run_rsi(analyzer, visualizer, symbol):
+    """Calculate and plot RSI for a stock"""
+    print(f"\nCalculating RSI for {symbol}...")
+    prices = analyzer.stocks[symbol].get_closing_prices()
+    rsi = analyzer.calculate_rsi(prices)
+    visualizer.plot_rsi(symbol, rsi)
+
+def run_macd(analyzer, visualizer, symbol):
+    """Calculate and plot MACD for a stock"""
+    print(f"\nCalculating MACD for {symbol}...")
+    prices = analyzer.stocks[symbol].get_closing_prices()
+    macd, signal = analyzer.calculate_macd(prices)
+    visualizer.plot_macd(symbol, macd, signal)
+
+def run_bollinger_bands(analyzer, visualizer, symbol):
+    """Calculate and plot Bollinger Bands for a stock"""
+    print(f"\nCalculating Bollinger Bands for {symbol}...")
+    prices = analyzer.stocks[symbol].get_closing_prices()
+    sma, upper_band, lower_band = analyzer.calculate_bollinger_bands(prices)
+    visualizer.plot_bollinger_bands(symbol, prices, sma, upper_band, lower_band)
+
+def run_correlation_matrix(analyzer, visualizer, symbols):
+    """Calculate and plot the return correlation matrix for several stocks"""
+    print(f"\nCalculating correlation matrix for {', '.join(symbols)}...")
+    result = analyzer.calculate_correlation_matrix(symbols)
+    if result is not None:
+        symbols, corr_matrix = result
+        visualizer.plot_correlation_matrix(symbols, corr_matrix)
+
+def run_correlation_scatter(analyzer, visualizer, symbols):
+    """Plot the return scatter for exactly two stocks"""
+    print(f"\nCreating scatter plot for {symbols[0]} vs {symbols[1]}...")
+    visualizer.plot_correlation_scatter(analyzer.stocks.keys(), symbols)
+
+def run_report(analyzer, visualizer, symbols, output_pdf):
+    """Generate the comprehensive PDF report for the given stocks"""
+    if not output_pdf.endswith('.pdf'):
+        output_pdf += '.pdf'
+    print(f"\nGenerating comprehensive PDF report for {', '.join(symbols)}...")
+    visualizer.generate_comprehensive_report(symbols, output_pdf)
+    return output_pdf
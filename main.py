@@ -1,20 +1,23 @@
+import argparse
 from stock_data import StockData
 from stock_analyzer import StockAnalyzer
 from stock_visualizer import StockVisualizer
+import commands
 
 def show_stock_options(stocks):
     """Display available stock options and get user's choice."""
+    symbols = tuple(stocks.keys())
     print("\nAvailable Stocks:")
-    for i, symbol in enumerate(stocks.keys(), 1):
+    for i, symbol in enumerate(symbols, 1):
         print(f"{i}. {symbol}")
     
     while True:
         try:
             choice = int(input("Select a stock by number: "))
-            if 1 <= choice <= len(stocks):
-                return list(stocks.keys())[choice - 1]
+            if 1 <= choice <= len(symbols):
+                return symbols[choice - 1]
             else:
-                print(f"Please enter a number between 1 and {len(stocks)}.")
+                print(f"Please enter a number between 1 and {len(symbols)}.")
         except ValueError:
             print("Invalid input. Please enter a number.")
 
@@ -45,8 +48,9 @@ def select_multiple_stocks(stocks, min_count=2, max_count=5):
         print(f"Need at least {min_count} stocks loaded.")
         return []
     
+    symbols = tuple(stocks.keys())
     print("\nAvailable Stocks:")
-    for i, symbol in enumerate(stocks.keys(), 1):
+    for i, symbol in enumerate(symbols, 1):
         print(f"{i}. {symbol}")
     
     selected = []
@@ -67,15 +71,15 @@ def select_multiple_stocks(stocks, min_count=2, max_count=5):
                     break
                 else:
                     print(f"Please select at least {min_count} stocks.")
-            elif 1 <= choice <= len(stocks):
-                symbol = list(stocks.keys())[choice - 1]
+            elif 1 <= choice <= len(symbols):
+                symbol = symbols[choice - 1]
                 if symbol not in selected:
                     selected.append(symbol)
                     print(f"Added {symbol}, selected {len(selected)}/{max_count}")
                 else:
                     print(f"{symbol} already selected.")
             else:
-                print(f"Please enter a number between 0 and {len(stocks)}.")
+                print(f"Please enter a number between 0 and {len(symbols)}.")
         except ValueError:
             print("Invalid input. Please enter a number.")
     
@@ -129,37 +133,51 @@ def correlation_analysis_menu(analyzer, visualizer):
         # Correlation matrix
         selected_symbols = select_multiple_stocks(analyzer.stocks, min_count=2, max_count=5)
         if selected_symbols:
-            print(f"\nCalculating correlation matrix for {', '.join(selected_symbols)}...")
-            symbols, corr_matrix = analyzer.calculate_correlation_matrix(selected_symbols)
-            if symbols and corr_matrix is not None:
-                visualizer.plot_correlation_matrix(symbols, corr_matrix)
+            commands.run_correlation_matrix(analyzer, visualizer, selected_symbols)
     
     elif choice == 2:
         # Correlation scatter plot
         print("\nFor scatter plot analysis, you must select exactly 2 stocks.")
         selected_symbols = select_multiple_stocks(analyzer.stocks, min_count=2, max_count=2)
         if len(selected_symbols) == 2:
-            print(f"\nCreating scatter plot for {selected_symbols[0]} vs {selected_symbols[1]}...")
-            visualizer.plot_correlation_scatter(analyzer.stocks.keys(), selected_symbols)
+            commands.run_correlation_scatter(analyzer, visualizer, selected_symbols)
 
+def parse_args():
+    """Parse command-line options for batch (non-interactive) runs"""
+    parser = argparse.ArgumentParser(description="Stock Analysis System")
+    parser.add_argument('--files', nargs='+', metavar='CSV',
+                        help="stock CSV files to load (defaults to the bundled samples)")
+    parser.add_argument('--report', nargs='+', metavar='SYMBOL',
+                        help="generate the PDF report for these symbols and exit")
+    parser.add_argument('--output', default='stock_report.pdf',
+                        help="output PDF path for --report (default: stock_report.pdf)")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    
     # Create analyzer
     analyzer = StockAnalyzer()
     
     # Add some stocks (with error handling)
-    sample_stocks = ['AAPL.csv', 'GOOGL.csv', 'MSFT.csv', 'META.csv', 'AMZN.csv']
-    for stock_file in sample_stocks:
-        stock = StockData(f"{stock_file}")
-        analyzer.add_stock(stock)
+    sample_stocks = args.files or ['AAPL.csv', 'GOOGL.csv', 'MSFT.csv', 'META.csv', 'AMZN.csv']
+    analyzer.add_stocks(StockData(stock_file) for stock_file in sample_stocks)
+    
+    # Batch mode: no prompts, just run the requested command
+    if args.report:
+        if not analyzer.stocks:
+            print("Failed to load any stocks. Exiting program.")
+            return
+        visualizer = StockVisualizer(analyzer)
+        output_pdf = commands.run_report(analyzer, visualizer, args.report, args.output)
+        print(f"\nPDF report has been successfully generated: {output_pdf}")
+        return
     
     # Check if any stocks were loaded successfully
     if not analyzer.stocks:
         print("Failed to load any sample stocks. Please provide valid stock data files.")
         stock_files = load_multiple_stocks()
-        for stock_file in stock_files:
-            stock = StockData(stock_file)
-            analyzer.add_stock(stock)
+        analyzer.add_stocks(StockData(stock_file) for stock_file in stock_files)
         
         if not analyzer.stocks:
             print("Still failed to load any stocks. Exiting program.")
@@ -174,43 +192,22 @@ def main():
         if choice == 1:
             print("\nMoving Averages Analysis")
             selected_symbol = show_stock_options(analyzer.stocks)
-            print(f"\nCalculating Moving Averages for {selected_symbol}...")
-            
-            stock = analyzer.stocks[selected_symbol]
-            prices = stock.get_closing_prices()
-            sma = analyzer.calculate_sma(prices, window=30)
-            ema = analyzer.calculate_ema(prices, window=30)
-            visualizer.plot_moving_averages(selected_symbol, prices, sma, ema)
+            commands.run_moving_averages(analyzer, visualizer, selected_symbol)
 
         elif choice == 2:
             print("\nRSI Analysis")
             selected_symbol = show_stock_options(analyzer.stocks)
-            print(f"\nCalculating RSI for {selected_symbol}...")
-            
-            stock = analyzer.stocks[selected_symbol]
-            prices = stock.get_closing_prices()
-            rsi = analyzer.calculate_rsi(prices)
-            visualizer.plot_rsi(selected_symbol, rsi)
+            commands.run_rsi(analyzer, visualizer, selected_symbol)
 
         elif choice == 3:
             print("\nMACD Analysis")
             selected_symbol = show_stock_options(analyzer.stocks)
-            print(f"\nCalculating MACD for {selected_symbol}...")
-            
-            stock = analyzer.stocks[selected_symbol]
-            prices = stock.get_closing_prices()
-            macd, signal = analyzer.calculate_macd(prices)
-            visualizer.plot_macd(selected_symbol, macd, signal)
+            commands.run_macd(analyzer, visualizer, selected_symbol)
 
         elif choice == 4:
             print("\nBollinger Bands Analysis")
             selected_symbol = show_stock_options(analyzer.stocks)
-            print(f"\nCalculating Bollinger Bands for {selected_symbol}...")
-            
-            stock = analyzer.stocks[selected_symbol]
-            prices = stock.get_closing_prices()
-            sma, upper_band, lower_band = analyzer.calculate_bollinger_bands(prices)
-            visualizer.plot_bollinger_bands(selected_symbol, prices, sma, upper_band, lower_band)
+            commands.run_bollinger_bands(analyzer, visualizer, selected_symbol)
             
         elif choice == 5:
             print("\nCorrelation Analysis")
@@ -218,9 +215,7 @@ def main():
             if len(analyzer.stocks) < 2:
                 print("Need at least 2 stocks for correlation analysis. Loading new stocks...")
                 new_stock_files = load_multiple_stocks()
-                for stock_file in new_stock_files:
-                    stock = StockData(stock_file)
-                    analyzer.add_stock(stock)
+                analyzer.add_stocks(StockData(stock_file) for stock_file in new_stock_files)
                 
                 if len(analyzer.stocks) < 2:
                     print("Failed to load enough stocks for correlation analysis.")
@@ -236,9 +231,7 @@ def main():
             if not analyzer.stocks:
                 print("No stocks loaded. Loading stocks now...")
                 new_stock_files = load_multiple_stocks()
-                for stock_file in new_stock_files:
-                    stock = StockData(stock_file)
-                    analyzer.add_stock(stock)
+                analyzer.add_stocks(StockData(stock_file) for stock_file in new_stock_files)
                 
                 if not analyzer.stocks:
                     print("Failed to load any stocks. Please try again.")
@@ -251,11 +244,7 @@ def main():
             if selected_symbols:
                 # Ask for PDF output file
                 output_pdf = input("\nEnter the output PDF file path (e.g., stock_report.pdf): ")
-                if not output_pdf.endswith('.pdf'):
-                    output_pdf += '.pdf'
-                
-                print(f"\nGenerating comprehensive PDF report for {', '.join(selected_symbols)}...")
-                visualizer.generate_comprehensive_report(selected_symbols, output_pdf)
+                output_pdf = commands.run_report(analyzer, visualizer, selected_symbols, output_pdf)
                 print(f"\nPDF report has been successfully generated: {output_pdf}")
             else:
                 print("No stocks were selected for the report.")
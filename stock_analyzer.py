@@ -1,73 +1,313 @@
+import functools
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+# Recurrences shorter than this run as plain Python loops, which take
+# microseconds at that size; longer ones go through scipy's lfilter, or a
+# numba-compiled loop when scipy is missing. Both are imported on first use.
+_VECTORIZE_MIN_SAMPLES = 10_000
+
+@functools.lru_cache(maxsize=None)
+def _lfilter():
+    """Return scipy.signal.lfilter, imported on first use, or None without scipy"""
+    try:
+        from scipy.signal import lfilter
+    except ImportError:
+        return None
+    return lfilter
+
+@functools.lru_cache(maxsize=None)
+def _jit(func):
+    """Return func compiled with numba (imported on first use), or None without numba"""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(func)
+
+def _loop(func, n):
+    """Pick the plain loop for short inputs and the numba-compiled one, if any, for long inputs"""
+    if n < _VECTORIZE_MIN_SAMPLES:
+        return func
+    return _jit(func) or func
+
+def _smooth_loop(values, alpha, seed):
+    """Run y[i] = alpha * values[i] + (1 - alpha) * y[i-1] starting from y[-1] = seed"""
+    out = np.empty(values.shape[0])
+    prev = seed
+    for i in range(values.shape[0]):
+        prev = alpha * float(values[i]) + (1.0 - alpha) * prev
+        out[i] = prev
+    return out
+
+def _smooth(values, alpha, seed):
+    """First-order recursive smoothing shared by EMA and Wilder's RSI averages.
+    
+    Long inputs use scipy.signal.lfilter, or the numba-compiled loop when scipy
+    is missing; short inputs (and installs with neither) use the plain loop.
+    """
+    n = values.shape[0]
+    lfilter = _lfilter() if n >= _VECTORIZE_MIN_SAMPLES else None
+    if lfilter is not None:
+        smoothed, _ = lfilter(np.array([alpha]), np.array([1.0, -(1.0 - alpha)]),
+                              values, zi=np.array([(1.0 - alpha) * seed]))
+        return smoothed
+    return _loop(_smooth_loop, n)(values, float(alpha), float(seed))
+
+def _two_emas_loop(prices, short_window, long_window, short_seed, long_seed):
+    """Walk prices once, advancing the short and long EMA recurrences together"""
+    n = prices.shape[0]
+    ema_short = np.empty(n, dtype=np.float32)
+    ema_long = np.empty(n, dtype=np.float32)
+    alpha_short = 2.0 / (short_window + 1)
+    alpha_long = 2.0 / (long_window + 1)
+    prev_short = short_seed
+    prev_long = long_seed
+    for i in range(n):
+        price = float(prices[i])
+        if i >= short_window:
+            prev_short = alpha_short * price + (1.0 - alpha_short) * prev_short
+        if i >= long_window:
+            prev_long = alpha_long * price + (1.0 - alpha_long) * prev_long
+        ema_short[i] = prev_short
+        ema_long[i] = prev_long
+    return ema_short, ema_long
+
+def _two_emas(prices, short_window, long_window):
+    """Short and long EMAs of the same prices, each seeded with its first SMA value"""
+    short_seed = float(np.float32(prices[:short_window].mean(dtype=np.float64)))
+    long_seed = float(np.float32(prices[:long_window].mean(dtype=np.float64)))
+    n = prices.shape[0]
+    if n >= _VECTORIZE_MIN_SAMPLES and _lfilter() is not None:
+        ema_short = np.empty_like(prices)
+        ema_long = np.empty_like(prices)
+        ema_short[:short_window] = short_seed
+        ema_short[short_window:] = _smooth(prices[short_window:], 2 / (short_window + 1), short_seed)
+        ema_long[:long_window] = long_seed
+        ema_long[long_window:] = _smooth(prices[long_window:], 2 / (long_window + 1), long_seed)
+        return ema_short, ema_long
+    return _loop(_two_emas_loop, n)(prices, short_window, long_window, short_seed, long_seed)
+
+def _memoized(method):
+    """Cache an indicator result per (prices array, parameters) on the analyzer.
+    
+    Only a loaded stock's closing prices are cached, so the cache is bounded by
+    the loaded stocks and the parameter sets used on them; any other array
+    (derived series, ad-hoc inputs) is computed without an entry. Entries keep
+    a reference to the prices array and are only reused for that exact object.
+    Cached arrays are returned read-only since every caller shares them.
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, prices, *args, **kwargs):
+        if not self._is_stock_prices(prices):
+            return method(self, prices, *args, **kwargs)
+        bound = signature.bind(self, prices, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, id(prices), tuple(bound.arguments.values())[2:])
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] is prices:
+            return hit[1]
+        result = method(self, prices, *args, **kwargs)
+        for array in (result if isinstance(result, tuple) else (result,)):
+            array.flags.writeable = False
+        self._cache[key] = (prices, result)
+        return result
+    return wrapper
+
+# Below this many closing prices in total, starting loky workers (each has to
+# import numba/pandas and unpickle its stock) costs far more than the indicators
+_PARALLEL_MIN_PRICES = 300_000
+
 class StockAnalyzer:
     """Handles analysis of multiple stocks"""
     def __init__(self):
         self.stocks = {}
+        self._cache = {}
+        self._corr_cache = {}
+        
+    def _is_loaded(self, stock_data):
+        """Check whether the same file was already parsed this session"""
+        loaded = self.stocks.get(stock_data.symbol)
+        return loaded is not None and loaded.file_path == stock_data.file_path
+        
+    def _is_stock_prices(self, prices):
+        """Check whether prices is the closing-price array of a loaded stock"""
+        return any(prices is stock.get_closing_prices() for stock in self.stocks.values())
         
     def add_stock(self, stock_data):
         """Add a stock to the analyzer"""
+        if self._is_loaded(stock_data):
+            # Keep the loaded stock and its cached indicators
+            return
         if stock_data.load_data():
             self.stocks[stock_data.symbol] = stock_data
+            self._cache.clear()
+        self._corr_cache.clear()
+    
+    def add_stocks(self, stock_datas):
+        """Add several stocks, loading their files concurrently"""
+        pending = [stock_data for stock_data in stock_datas if not self._is_loaded(stock_data)]
+        if not pending:
+            return
+        
+        # File reads and CSV parsing release the GIL, so threads overlap the loads
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            loaded = list(executor.map(lambda stock_data: stock_data.load_data(), pending))
+        
+        # Register in the given order so menus list stocks predictably
+        for stock_data, ok in zip(pending, loaded):
+            if ok:
+                self.stocks[stock_data.symbol] = stock_data
+        self._cache.clear()
+        self._corr_cache.clear()
+    
+    def get_symbol_indicators(self, symbols):
+        """Return the report indicators for each symbol, computing only uncached ones.
+        
+        Missing symbols are computed in parallel worker processes when there are
+        several of them and enough data to pay for the workers, otherwise in this
+        process; results are cached against the stock's current prices so
+        repeated reports reuse them.
+        """
+        def cache_key(symbol):
+            return ('symbol_indicators', symbol)
+        
+        def cached(symbol):
+            hit = self._cache.get(cache_key(symbol))
+            return hit is not None and hit[0] is self.stocks[symbol].get_closing_prices()
+        
+        missing = [symbol for symbol in dict.fromkeys(symbols) if not cached(symbol)]
+        if missing:
+            stocks = [self.stocks[symbol] for symbol in missing]
+            total_prices = sum(len(stock.get_closing_prices()) for stock in stocks)
+            if len(stocks) > 1 and total_prices >= _PARALLEL_MIN_PRICES:
+                from joblib import Parallel, delayed
+                n_jobs = min(len(stocks), os.cpu_count() or 1)
+                computed = Parallel(n_jobs=n_jobs, backend='loky')(
+                    delayed(compute_symbol_indicators)(stock) for stock in stocks)
+            else:
+                computed = [compute_symbol_indicators(stock) for stock in stocks]
+            for symbol, indicators in zip(missing, computed):
+                for array in indicators.values():
+                    array.flags.writeable = False
+                self._cache[cache_key(symbol)] = (self.stocks[symbol].get_closing_prices(), indicators)
+        
+        return [self._cache[cache_key(symbol)][1] for symbol in symbols]
 
+    @_memoized
     def calculate_sma(self, prices, window):
-        """Calculate Simple Moving Average"""
+        """Calculate Simple Moving Average.
+        
+        Results for a loaded stock's closing prices are cached and returned
+        read-only; copy them before modifying in place.
+        """
         if len(prices) < window:
             return np.array([])
-        return np.convolve(prices, np.ones(window)/window, 'valid')
+        prices = np.asarray(prices, dtype=np.float32)
+        # Rolling-sum identity: SMA[t] = (c[t] - c[t-window]) / window, summed in float64
+        c = np.cumsum(prices, dtype=np.float64)
+        sma = (c[window-1:] - np.concatenate(([0.0], c[:-window]))) / window
+        return sma.astype(np.float32)
     
+    @_memoized
     def calculate_ema(self, prices, window):
-        """Calculate Exponential Moving Average"""
+        """Calculate Exponential Moving Average.
+        
+        Results for a loaded stock's closing prices are cached and returned
+        read-only; copy them before modifying in place.
+        """
         if len(prices) < window:
             return np.array([])
-        ema = np.zeros_like(prices)
-        ema[:window] = np.mean(prices[:window])
+        # Seed with the first SMA value so EMA and SMA start from the same point
+        seed = self.calculate_sma(prices, window)[0]
+        prices = np.asarray(prices, dtype=np.float32)
         alpha = 2 / (window + 1)
-        for i in range(window, len(prices)):
-            ema[i] = alpha * prices[i] + (1 - alpha) * ema[i-1]
+        ema = np.empty_like(prices)
+        ema[:window] = seed
+        ema[window:] = _smooth(prices[window:], alpha, seed)
         return ema
     
+    @_memoized
     def calculate_rsi(self, prices, window=14):
-        """Calculate Relative Strength Index (RSI)"""
-        if len(prices) < window:
+        """Calculate Relative Strength Index (RSI).
+        
+        Results for a loaded stock's closing prices are cached and returned
+        read-only; copy them before modifying in place.
+        """
+        if len(prices) <= window:
             return np.array([])
         
+        prices = np.asarray(prices, dtype=np.float32)
         deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
+        gains = np.maximum(deltas, np.float32(0))
+        losses = np.maximum(-deltas, np.float32(0))
         
-        avg_gain = np.zeros_like(prices)
-        avg_loss = np.zeros_like(prices)
+        # Every slot from `window` onward is overwritten; mark the warm-up region invalid
+        avg_gain = np.empty_like(prices)
+        avg_loss = np.empty_like(prices)
+        avg_gain[:window] = np.nan
+        avg_loss[:window] = np.nan
         
-        avg_gain[window] = np.mean(gains[:window])
-        avg_loss[window] = np.mean(losses[:window])
+        avg_gain[window] = np.mean(gains[:window], dtype=np.float64)
+        avg_loss[window] = np.mean(losses[:window], dtype=np.float64)
         
-        for i in range(window+1, len(prices)):
-            avg_gain[i] = (avg_gain[i-1] * (window-1) + gains[i-1]) / window
-            avg_loss[i] = (avg_loss[i-1] * (window-1) + losses[i-1]) / window
+        # Wilder smoothing avg[i] = (avg[i-1] * (window-1) + x[i-1]) / window
+        avg_gain[window+1:] = _smooth(gains[window:], 1.0 / window, avg_gain[window])
+        avg_loss[window+1:] = _smooth(losses[window:], 1.0 / window, avg_loss[window])
         
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        # No losses pushes RSI to 100; no movement at all is neutral (50)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / np.where(avg_loss == 0, np.finfo(prices.dtype).eps, avg_loss)
+            rsi = 100 - (100 / (1 + rs))
+        rsi[(avg_gain == 0) & (avg_loss == 0)] = 50
         return rsi
     
+    @_memoized
     def calculate_macd(self, prices, short_window=12, long_window=26, signal_window=9):
-        """Calculate MACD and Signal Line"""
-        ema_short = self.calculate_ema(prices, short_window)
-        ema_long = self.calculate_ema(prices, long_window)
-        macd = ema_short - ema_long
+        """Calculate MACD and Signal Line.
+        
+        Results for a loaded stock's closing prices are cached and returned
+        read-only; copy them before modifying in place.
+        """
+        if len(prices) < max(short_window, long_window):
+            return np.array([]), np.array([])
+        prices = np.asarray(prices, dtype=np.float32)
+        ema_short, ema_long = _two_emas(prices, short_window, long_window)
+        # Subtract in place; the short EMA buffer becomes the MACD line
+        macd = np.subtract(ema_short, ema_long, out=ema_short)
         signal = self.calculate_ema(macd, signal_window)
         return macd, signal
     
+    @_memoized
     def calculate_bollinger_bands(self, prices, window=20, num_std=2):
-        """Calculate Bollinger Bands"""
+        """Calculate Bollinger Bands.
+        
+        Results for a loaded stock's closing prices are cached and returned
+        read-only; copy them before modifying in place.
+        """
         if len(prices) < window:
             return np.array([]), np.array([]), np.array([])
+        prices = np.asarray(prices, dtype=np.float32)
             
         sma = self.calculate_sma(prices, window)
-        rolling_std = np.array([np.std(prices[i:i+window]) for i in range(len(prices)-window+1)])
         
-        upper_band = sma + (rolling_std * num_std)
-        lower_band = sma - (rolling_std * num_std)
+        # Rolling std from windowed running sums: var = E[x^2] - E[x]^2.
+        # Sums are kept in float64 over mean-shifted prices to limit cancellation.
+        shifted = np.asarray(prices, dtype=np.float64)
+        shifted = shifted - shifted.mean()
+        c1 = np.cumsum(np.insert(shifted, 0, 0.0))
+        c2 = np.cumsum(np.insert(shifted * shifted, 0, 0.0))
+        s1 = (c1[window:] - c1[:-window]) / window
+        s2 = (c2[window:] - c2[:-window]) / window
+        rolling_std = np.sqrt(np.maximum(s2 - s1 * s1, 0.0)).astype(np.float32)
+        
+        band_width = rolling_std * np.float32(num_std)
+        upper_band = sma + band_width
+        lower_band = sma - band_width
         
         return sma, upper_band, lower_band
     
@@ -77,44 +317,69 @@ class StockAnalyzer:
             print("Need at least 2 stocks to calculate correlation")
             return None
         
-        # Get closing prices for all symbols
-        price_data = {}
-        min_length = float('inf')
+        # Reuse the matrix already computed for this set of symbols
+        cached = self._corr_cache.get(frozenset(symbols))
+        if cached is not None:
+            cached_symbols, cached_matrix = cached
+            symbols_list = list(dict.fromkeys(symbols))
+            order = [cached_symbols.index(symbol) for symbol in symbols_list]
+            if order == sorted(order):
+                return symbols_list, cached_matrix
+            # A reordered copy is read-only too, so hits and misses behave the same
+            reordered = cached_matrix[np.ix_(order, order)]
+            reordered.setflags(write=False)
+            return symbols_list, reordered
         
-        # First pass: get lengths to determine the minimum common length
+        # Gather each stock's precomputed daily returns in a single pass
+        returns_data = {}
         for symbol in symbols:
-            if symbol in self.stocks:
-                prices = self.stocks[symbol].get_closing_prices()
-                if len(prices) > 0:
-                    price_data[symbol] = prices
-                    min_length = min(min_length, len(prices))
-                else:
-                    print(f"No price data available for {symbol}")
-                    return None
-            else:
+            stock = self.stocks.get(symbol)
+            if stock is None:
                 print(f"Stock {symbol} not found")
                 return None
+            if len(stock.get_closing_prices()) == 0:
+                print(f"No price data available for {symbol}")
+                return None
+            returns_data[symbol] = stock.returns
         
-        # Second pass: trim all arrays to minimum common length and calculate returns
-        aligned_returns = {}
-        for symbol, prices in price_data.items():
-            # Trim to common length (most recent data)
-            trimmed_prices = prices[-min_length:]
-            # Calculate daily returns
-            returns = np.diff(trimmed_prices) / trimmed_prices[:-1]
-            aligned_returns[symbol] = returns
-        
-        # Build correlation matrix
-        symbols_list = list(aligned_returns.keys())
-        n = len(symbols_list)
-        corr_matrix = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(n):
-                sym1 = symbols_list[i]
-                sym2 = symbols_list[j]
-                # Calculate correlation coefficient
-                corr = np.corrcoef(aligned_returns[sym1], aligned_returns[sym2])[0, 1]
-                corr_matrix[i, j] = corr
-        
-        return symbols_list, corr_matrix
\ No newline at end of file
+        # Trim to the common length (most recent data) while stacking into one buffer
+        symbols_list = list(returns_data)
+        length = min(map(len, returns_data.values()))
+        returns_matrix = np.empty((len(symbols_list), length), dtype=np.float32)
+        for row, symbol in zip(returns_matrix, symbols_list):
+            returns = returns_data[symbol]
+            row[:] = returns[len(returns) - length:]
+        
+        # Build correlation matrix: standardize each return series once, then one einsum
+        returns_matrix -= returns_matrix.mean(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns_matrix /= returns_matrix.std(axis=1, keepdims=True)
+        corr_matrix = np.einsum('ik,jk->ij', returns_matrix, returns_matrix, optimize=True) / returns_matrix.shape[1]
+        np.clip(corr_matrix, -1, 1, out=corr_matrix)
+        # The cached matrix is shared with the caller, so hand it out read-only
+        corr_matrix.flags.writeable = False
+        self._corr_cache[frozenset(symbols_list)] = (symbols_list, corr_matrix)
+        
+        return symbols_list, corr_matrix
+
+def compute_symbol_indicators(stock):
+    """Compute every indicator used by the report for a single stock.
+    
+    Module-level so it can be shipped to worker processes along with the
+    (picklable) StockData.
+    """
+    analyzer = StockAnalyzer()
+    prices = stock.get_closing_prices()
+    rsi = analyzer.calculate_rsi(prices)
+    macd, signal = analyzer.calculate_macd(prices)
+    sma, upper_band, lower_band = analyzer.calculate_bollinger_bands(prices)
+    ema = analyzer.calculate_ema(prices, window=30)
+    return {
+        "rsi": rsi,
+        "macd": macd,
+        "signal": signal,
+        "sma": sma,
+        "upper_band": upper_band,
+        "lower_band": lower_band,
+        "ema": ema
+    }
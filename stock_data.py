@@ -1,38 +1,119 @@
+import os
+import tempfile
 import numpy as np
-from datetime import datetime
+import pandas as pd
+
+# Layout of the parsed-CSV cache written next to each data file
+CACHE_DTYPE = np.dtype([('Date', 'datetime64[D]'),
+                        ('Open', np.float32),
+                        ('High', np.float32),
+                        ('Low', np.float32),
+                        ('Close', np.float32),
+                        ('Volume', np.float64)])
+
 class StockData:
     """Handles loading and basic processing of stock data"""
     def __init__(self, file_path):
         self.file_path = file_path
-        self.data = None
         self.dates = None
+        # One contiguous array per column [Open, High, Low, Close, Volume]
+        self.open = None
+        self.high = None
+        self.low = None
+        self.close = None
+        self.volume = None
+        self.returns = None
         self.symbol = file_path.split('/')[-1].split('.')[0]
         
+    def _parse_csv(self):
+        """Parse the CSV into a record array with one field per column"""
+        # Load data with explicit dtype specification (C tokenizer)
+        raw_data = pd.read_csv(self.file_path,
+                               usecols=['Date', 'Open', 'High', 'Low', 'Close', 'Volume'],
+                               dtype={'Date': str,
+                                      'Open': np.float32,
+                                      'High': np.float32,
+                                      'Low': np.float32,
+                                      'Close': np.float32,
+                                      'Volume': np.float64})
+        
+        # Ensure data is not empty
+        if len(raw_data) == 0:
+            raise ValueError(f"No data found in {self.file_path}")
+        
+        table = np.empty(len(raw_data), dtype=CACHE_DTYPE)
+        # ISO date strings cast to datetime64 in one vectorized pass
+        try:
+            table['Date'] = raw_data['Date'].to_numpy().astype('datetime64[D]')
+        except ValueError:
+            table['Date'] = pd.to_datetime(raw_data['Date'], format='%Y-%m-%d',
+                                           cache=True).to_numpy().astype('datetime64[D]')
+        for column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+            table[column] = raw_data[column].to_numpy()
+        return table
+    
+    def _source_stamp(self):
+        """Size and nanosecond mtime of the CSV, stored with the cache to validate it"""
+        stat = os.stat(self.file_path)
+        return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    
+    def _load_cache(self, cache_path, stamp):
+        """Read the binary column cache, or return None if it is unusable or stale"""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_stamp = np.load(f)
+                # A copied or restored CSV can carry an older mtime, so require an exact match
+                if not np.array_equal(cached_stamp, stamp):
+                    return None
+                table = np.load(f)
+        except Exception:
+            return None  # Corrupt, half-written or old-format file; it is rebuilt from the CSV
+        return table if table.dtype == CACHE_DTYPE else None
+    
+    def _save_cache(self, cache_path, stamp, table):
+        """Write the source stamp and column cache atomically via a temp file in the same directory"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.',
+                                            prefix=os.path.basename(cache_path) + '.',
+                                            suffix='.tmp')
+        except OSError:
+            return  # Read-only location; parse again next time
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, stamp)
+                np.save(f, table)
+            # Concurrent loads of the same file each replace it with a complete cache
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
     def load_data(self):
+        if not os.path.isfile(self.file_path):
+            print(f"Error loading {self.symbol}: {self.file_path} not found")
+            return False
+        
         try:    
-            # Load data with explicit dtype specification
-            raw_data = np.genfromtxt(self.file_path, 
-                                   delimiter=',', 
-                                   dtype=None,
-                                   names=True,
-                                   encoding=None)
+            # Reuse the parsed columns saved next to the CSV while its size and mtime match
+            cache_path = self.file_path + '.npy'
+            stamp = self._source_stamp()
+            table = self._load_cache(cache_path, stamp) if os.path.isfile(cache_path) else None
+            if table is None:
+                table = self._parse_csv()
+                self._save_cache(cache_path, stamp, table)
             
-            # Ensure data is not empty
-            if len(raw_data) == 0:
-                raise ValueError(f"No data found in {self.file_path}")
-                
-            # Convert to structured arrays for better handling
-            self.dates = np.array([datetime.strptime(str(date), '%Y-%m-%d') 
-                                 for date in raw_data['Date']])
+            # Store columns separately so close-only consumers touch only Close
+            self.dates = np.array(table['Date'])
+            self.open = np.array(table['Open'])
+            self.high = np.array(table['High'])
+            self.low = np.array(table['Low'])
+            self.close = np.array(table['Close'])
+            self.volume = np.array(table['Volume'])
             
-            # Create price matrix [Open, High, Low, Close, Volume]
-            self.data = np.column_stack((
-                raw_data['Open'],
-                raw_data['High'],
-                raw_data['Low'],
-                raw_data['Close'],
-                raw_data['Volume']
-            ))
+            # Daily returns never change once loaded, so compute them once here
+            self.returns = np.diff(self.close) / self.close[:-1]
             
             return True
             
@@ -42,6 +123,6 @@ class StockData:
     
     def get_closing_prices(self):
         """Return the closing prices"""
-        if self.data is not None:
-            return self.data[:, 3]  # Close prices
+        if self.close is not None:
+            return self.close
         return np.array([])
\ No newline at end of file
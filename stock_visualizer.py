@@ -1,124 +1,190 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import io
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+
+# matplotlib and reportlab are imported on first use, so importing this module
+# (or running analysis that never draws) does not pay for them at startup
+_pyplot = None
+
+# Cached per process so report workers also reuse a single off-screen figure
+_canvas = None
+
+# Annotation colour for weak (|r| <= 0.5) and strong correlation cells
+_ANNOTATION_COLORS = np.array(['black', 'white'])
+
+# Size in points at which each report chart is placed in the PDF. Rendering at
+# 72 dpi with the matching figure size gives pixels 1:1 with the placed image.
+_REPORT_DPI = 72
+_PDF_CHART_SIZES = {
+    "ma": (500, 300),
+    "rsi": (500, 200),
+    "macd": (500, 300),
+    "bollinger": (500, 300)
+}
+
+# Fewest report charts worth spreading across worker processes
+_PARALLEL_MIN_CHARTS = 16
+
+def _pdf_figsize(chart):
+    """Figure size in inches for a report chart rendered at _REPORT_DPI"""
+    width, height = _PDF_CHART_SIZES[chart]
+    return (width / _REPORT_DPI, height / _REPORT_DPI)
+
+def _plt():
+    """Return matplotlib.pyplot, importing it on the first interactive plot"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+        _pyplot = plt
+    return _pyplot
+
+def _print_png(buffer, draw, figsize, args, dpi=None):
+    """Draw a chart on this process's off-screen Agg figure and write the PNG into buffer"""
+    global _canvas
+    import matplotlib
+    if _canvas is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        _canvas = FigureCanvasAgg(Figure())
+    fig = _canvas.figure
+    fig.clear()
+    fig.set_size_inches(figsize)
+    fig.set_dpi(dpi or matplotlib.rcParams['figure.dpi'])
+    draw(fig.add_subplot(111), *args)
+    # zlib level 1 encodes several times faster than the default for a modestly larger PNG
+    _canvas.print_png(buffer, pil_kwargs={'compress_level': 1})
+
+def _render_chart_job(job):
+    """Worker entry point for one (draw, figsize, args, dpi) chart job; returns the PNG bytes"""
+    buffer = io.BytesIO()
+    _print_png(buffer, *job)
+    return buffer.getvalue()
+
+def _plot_series(ax, series_list, labels, colors, title, hlines=()):
+    """Draw line series plus dashed reference levels with the shared chart styling"""
+    for series, label, color in zip(series_list, labels, colors):
+        ax.plot(*series, label=label, color=color)
+    for level, label, color in hlines:
+        ax.axhline(level, color=color, linestyle='--', label=label)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+def _draw_moving_averages(ax, symbol, prices, sma, ema):
+    x = np.arange(len(prices))
+    _plot_series(ax, [(x, prices), (x[len(x)-len(sma):], sma), (ema,)],
+                 ['Close Prices', 'SMA', 'EMA'], ['blue', 'orange', 'green'],
+                 f'{symbol} - Moving Averages')
+
+def _draw_rsi(ax, symbol, rsi):
+    _plot_series(ax, [(rsi,)], ['RSI'], ['purple'], f'{symbol} - RSI',
+                 hlines=[(70, 'Overbought', 'red'), (30, 'Oversold', 'green')])
+
+def _draw_macd(ax, symbol, macd, signal):
+    _plot_series(ax, [(macd,), (signal,)], ['MACD', 'Signal Line'], ['blue', 'red'],
+                 f'{symbol} - MACD')
+
+def _draw_bollinger_bands(ax, symbol, prices, sma, upper_band, lower_band):
+    # One index array shared by every overlay; each band is aligned to the latest prices
+    x = np.arange(len(prices))
+    _plot_series(ax, [(x, prices),
+                      (x[len(x)-len(sma):], sma),
+                      (x[len(x)-len(upper_band):], upper_band),
+                      (x[len(x)-len(lower_band):], lower_band)],
+                 ['Close Prices', 'SMA', 'Upper Band', 'Lower Band'], ['blue', 'red', 'gray', 'gray'],
+                 f'{symbol} - Bollinger Bands')
+
+def _draw_correlation_matrix(ax, symbols, corr_matrix):
+    # Create the heatmap; the matrix is symmetric, so only the lower triangle
+    # (diagonal included) is shown and the NaN upper cells render blank
+    lower = np.tri(len(corr_matrix), dtype=bool)
+    image = ax.imshow(np.where(lower, corr_matrix, np.nan), cmap='coolwarm', vmin=-1, vmax=1)
+    
+    # Add colorbar
+    ax.figure.colorbar(image, ax=ax, label='Correlation Coefficient')
+    
+    # Add labels and ticks
+    ax.set_title('Stock Return Correlation Matrix')
+    ticks = np.arange(len(symbols))
+    ax.set_xticks(ticks, symbols, rotation=45)
+    ax.set_yticks(ticks, symbols)
+    
+    # Add text annotations: labels and colours are resolved up front for the
+    # annotated (lower-triangle) cells only, in one vectorized pass each
+    rows, cols = np.nonzero(lower)
+    values = corr_matrix[rows, cols]
+    labels = np.char.mod('%.2f', values)
+    cell_colors = _ANNOTATION_COLORS[(np.abs(values) > 0.5).astype(np.intp)]
+    # Text artists are added directly, skipping Axes.text's per-call setup; the
+    # limits are already fixed by imshow, so autoscaling is switched off
+    from matplotlib.text import Text
+    ax.set_autoscale_on(False)
+    for i, j, label, color in zip(rows, cols, labels, cell_colors):
+        ax.add_artist(Text(j, i, label, ha='center', va='center', color=color))
+    
+    ax.figure.tight_layout()
+
+def _draw_correlation_scatter(ax, sym1, sym2, returns1, returns2, corr, fit):
+    ax.scatter(returns1, returns2, alpha=0.5)
+    ax.set_title(f'Return Correlation: {sym1} vs {sym2} (r = {corr:.2f})')
+    ax.set_xlabel(f'{sym1} Daily Returns')
+    ax.set_ylabel(f'{sym2} Daily Returns')
+    ax.grid(True, alpha=0.3)
+    
+    # Add regression line
+    if fit is not None:
+        m, b = fit
+        ax.plot(returns1, m*returns1 + b, 'r-', alpha=0.7)
+        
+    ax.figure.tight_layout()
 
 class StockVisualizer:
     """Handles visualization of stock analysis"""
     def __init__(self, analyzer):
         self.analyzer = analyzer
 
-    def plot_moving_averages(self, symbol, prices, sma, ema, save_to_buffer=False):
-        """Plot Moving Averages"""
-        plt.figure(figsize=(10, 6))
-        plt.plot(prices, label='Close Prices', color='blue')
-        plt.plot(range(len(prices)-len(sma), len(prices)), sma, label='SMA', color='orange')
-        plt.plot(ema, label='EMA', color='green')
-        plt.title(f'{symbol} - Moving Averages')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
+    def _render(self, draw, figsize, save_to_buffer, *args, pdf_chart=None):
+        """Render a chart to a PNG buffer off-screen, or show it in a pyplot window.
         
+        Buffered report charts (pdf_chart) are rendered at their PDF placement size.
+        """
         if save_to_buffer:
+            # The PNG is written straight into the buffer handed back to the caller
             buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
+            if pdf_chart is not None:
+                _print_png(buffer, draw, _pdf_figsize(pdf_chart), args, _REPORT_DPI)
+            else:
+                _print_png(buffer, draw, figsize, args)
             buffer.seek(0)
-            plt.close()
             return buffer
-        else:
-            plt.show()
+        plt = _plt()
+        draw(plt.figure(figsize=figsize).add_subplot(111), *args)
+        plt.show()
+        return None
+
+    def plot_moving_averages(self, symbol, prices, sma, ema, save_to_buffer=False):
+        """Plot Moving Averages"""
+        return self._render(_draw_moving_averages, (10, 6), save_to_buffer, symbol, prices, sma, ema,
+                            pdf_chart="ma")
 
     def plot_rsi(self, symbol, rsi, save_to_buffer=False):
         """Plot RSI"""
-        plt.figure(figsize=(10, 4))
-        plt.plot(rsi, label='RSI', color='purple')
-        plt.axhline(70, color='red', linestyle='--', label='Overbought')
-        plt.axhline(30, color='green', linestyle='--', label='Oversold')
-        plt.title(f'{symbol} - RSI')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        if save_to_buffer:
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
-            buffer.seek(0)
-            plt.close()
-            return buffer
-        else:
-            plt.show()
+        return self._render(_draw_rsi, (10, 4), save_to_buffer, symbol, rsi, pdf_chart="rsi")
 
     def plot_macd(self, symbol, macd, signal, save_to_buffer=False):
         """Plot MACD and Signal Line"""
-        plt.figure(figsize=(10, 6))
-        plt.plot(macd, label='MACD', color='blue')
-        plt.plot(signal, label='Signal Line', color='red')
-        plt.title(f'{symbol} - MACD')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        if save_to_buffer:
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
-            buffer.seek(0)
-            plt.close()
-            return buffer
-        else:
-            plt.show()
+        return self._render(_draw_macd, (10, 6), save_to_buffer, symbol, macd, signal, pdf_chart="macd")
         
     def plot_bollinger_bands(self, symbol, prices, sma, upper_band, lower_band, save_to_buffer=False):
         """Plot Bollinger Bands"""
-        plt.figure(figsize=(10, 6))
-        plt.plot(prices, label='Close Prices', color='blue')
-        plt.plot(range(len(prices)-len(sma), len(prices)), sma, label='SMA', color='red')
-        plt.plot(range(len(prices)-len(upper_band), len(prices)), upper_band, label='Upper Band', color='gray')
-        plt.plot(range(len(prices)-len(lower_band), len(prices)), lower_band, label='Lower Band', color='gray')
-        plt.title(f'{symbol} - Bollinger Bands')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        if save_to_buffer:
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
-            buffer.seek(0)
-            plt.close()
-            return buffer
-        else:
-            plt.show()
+        return self._render(_draw_bollinger_bands, (10, 6), save_to_buffer,
+                            symbol, prices, sma, upper_band, lower_band, pdf_chart="bollinger")
     
     def plot_correlation_matrix(self, symbols, corr_matrix, save_to_buffer=False):
         """Plot correlation matrix as a heatmap"""
-        plt.figure(figsize=(10, 8))
-        # Create the heatmap
-        plt.imshow(corr_matrix, cmap='coolwarm', vmin=-1, vmax=1)
-        
-        # Add colorbar
-        plt.colorbar(label='Correlation Coefficient')
-        
-        # Add labels and ticks
-        plt.title('Stock Return Correlation Matrix')
-        plt.xticks(np.arange(len(symbols)), symbols, rotation=45)
-        plt.yticks(np.arange(len(symbols)), symbols)
-        
-        # Add text annotations
-        for i in range(len(symbols)):
-            for j in range(len(symbols)):
-                plt.text(j, i, f'{corr_matrix[i, j]:.2f}', 
-                         ha='center', va='center', 
-                         color='white' if abs(corr_matrix[i, j]) > 0.5 else 'black')
-        
-        plt.tight_layout()
-        
-        if save_to_buffer:
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
-            buffer.seek(0)
-            plt.close()
-            return buffer
-        else:
-            plt.show()
+        return self._render(_draw_correlation_matrix, (10, 8), save_to_buffer, symbols, corr_matrix)
         
     def plot_correlation_scatter(self, symbols, selected_symbols, save_to_buffer=False):
         """Plot scatter plots of returns for selected pairs of stocks"""
@@ -131,46 +197,27 @@ class StockVisualizer:
             print("One or both symbols not found")
             return None
             
-        # Get price data
-        prices1 = self.analyzer.stocks[sym1].get_closing_prices()
-        prices2 = self.analyzer.stocks[sym2].get_closing_prices()
+        # Daily returns are precomputed at load time; align them on the most recent common length
+        returns1 = self.analyzer.stocks[sym1].returns
+        returns2 = self.analyzer.stocks[sym2].returns
+        n = min(len(returns1), len(returns2))
+        returns1 = np.asarray(returns1[len(returns1) - n:], dtype=np.float64)
+        returns2 = np.asarray(returns2[len(returns2) - n:], dtype=np.float64)
         
-        # Ensure same length (use the shorter one)
-        min_length = min(len(prices1), len(prices2))
-        prices1 = prices1[-min_length:]
-        prices2 = prices2[-min_length:]
-        
-        # Calculate returns
-        returns1 = np.diff(prices1) / prices1[:-1]
-        returns2 = np.diff(prices2) / prices2[:-1]
-        
-        # Calculate correlation
-        corr = np.corrcoef(returns1, returns2)[0, 1]
+        # Correlation and least-squares line from one set of sums
+        sx, sy = returns1.sum(), returns2.sum()
+        sxx, syy, sxy = returns1 @ returns1, returns2 @ returns2, returns1 @ returns2
+        var_x = n * sxx - sx * sx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = (n * sxy - sx * sy) / np.sqrt(var_x * (n * syy - sy * sy))
+            fit = None
+            if n > 1:
+                m = (n * sxy - sx * sy) / var_x
+                fit = (m, (sy - m * sx) / n)
         
         # Create scatter plot
-        plt.figure(figsize=(10, 6))
-        plt.scatter(returns1, returns2, alpha=0.5)
-        plt.title(f'Return Correlation: {sym1} vs {sym2} (r = {corr:.2f})')
-        plt.xlabel(f'{sym1} Daily Returns')
-        plt.ylabel(f'{sym2} Daily Returns')
-        plt.grid(True, alpha=0.3)
-        
-        # Add regression line
-        if len(returns1) > 1:
-            m, b = np.polyfit(returns1, returns2, 1)
-            plt.plot(returns1, m*returns1 + b, 'r-', alpha=0.7)
-            
-        plt.tight_layout()
-        
-        if save_to_buffer:
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
-            buffer.seek(0)
-            plt.close()
-            return buffer
-        else:
-            plt.show()
-            return None
+        return self._render(_draw_correlation_scatter, (10, 6), save_to_buffer,
+                            sym1, sym2, returns1, returns2, corr, fit)
 
     def generate_comprehensive_report(self, symbols, output_pdf=None):
         """Generate a comprehensive report for multiple stocks"""
@@ -180,18 +227,27 @@ class StockVisualizer:
         print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 50)
 
+        found_symbols = []
         for symbol in symbols:
             if symbol not in self.analyzer.stocks:
                 print(f"Stock {symbol} not found. Skipping...")
                 continue
-                
+            found_symbols.append(symbol)
+        
+        # Calculate all indicators once per symbol; the summary, charts and PDF share them
+        all_indicators = self.analyzer.get_symbol_indicators(found_symbols)
+        
+        # Chart jobs are rendered together once every symbol has been summarized
+        chart_jobs = []
+        
+        for symbol, indicators in zip(found_symbols, all_indicators):
             stock = self.analyzer.stocks[symbol]
-            prices = stock.get_closing_prices()
+            # One contiguous float32 series shared by the summary and all price charts
+            prices = np.ascontiguousarray(stock.get_closing_prices(), dtype=np.float32)
             
-            # Calculate all indicators
-            rsi = self.analyzer.calculate_rsi(prices)
-            macd, signal = self.analyzer.calculate_macd(prices)
-            sma, upper_band, lower_band = self.analyzer.calculate_bollinger_bands(prices)
+            rsi = indicators["rsi"]
+            macd, signal = indicators["macd"], indicators["signal"]
+            sma, upper_band, lower_band = indicators["sma"], indicators["upper_band"], indicators["lower_band"]
             
             # Get latest values
             current_rsi = rsi[-1] if len(rsi) > 0 else None
@@ -222,27 +278,18 @@ class StockVisualizer:
                 }
             }
             
-            # Generate trading recommendation based on indicators
-            bullish_signals = 0
-            bearish_signals = 0
-            
-            if current_rsi is not None:
-                if current_rsi < 30:
-                    bullish_signals += 1
-                elif current_rsi > 70:
-                    bearish_signals += 1
-            
-            if current_macd is not None and current_signal is not None:
-                if current_macd > current_signal:
-                    bullish_signals += 1
-                else:
-                    bearish_signals += 1
-            
-            if len(upper_band) > 0 and len(lower_band) > 0:
-                if current_price < lower_band[-1]:
-                    bullish_signals += 1
-                elif current_price > upper_band[-1]:
-                    bearish_signals += 1
+            # Generate trading recommendation based on indicators: one
+            # (bullish, bearish) row per indicator, summed column-wise
+            has_rsi = current_rsi is not None
+            has_macd = current_macd is not None and current_signal is not None
+            has_bands = len(upper_band) > 0 and len(lower_band) > 0
+            macd_bullish = has_macd and current_macd > current_signal
+            signals = np.array([
+                [has_rsi and current_rsi < 30, has_rsi and current_rsi > 70],
+                [macd_bullish, has_macd and not macd_bullish],
+                [has_bands and current_price < lower_band[-1], has_bands and current_price > upper_band[-1]]
+            ], dtype=np.int8)
+            bullish_signals, bearish_signals = signals.sum(axis=0)
             
             if bullish_signals > bearish_signals:
                 recommendation = "Bullish - Consider buying/holding"
@@ -253,15 +300,20 @@ class StockVisualizer:
             
             stock_data["recommendation"] = recommendation
             
-            # Generate charts
+            # Generate charts, skipping those with nothing to plot (too little history)
             if output_pdf:
-                ema = self.analyzer.calculate_ema(prices, window=30)
-                stock_data["charts"] = {
-                    "ma": self.plot_moving_averages(symbol, prices, sma, ema[-len(prices):] if len(ema) > 0 else np.array([]), save_to_buffer=True),
-                    "rsi": self.plot_rsi(symbol, rsi, save_to_buffer=True),
-                    "macd": self.plot_macd(symbol, macd, signal, save_to_buffer=True),
-                    "bollinger": self.plot_bollinger_bands(symbol, prices, sma, upper_band, lower_band, save_to_buffer=True)
-                }
+                ema = indicators["ema"]
+                charts = stock_data["charts"] = {}
+                if len(prices) > 0:
+                    chart_jobs.append((charts, "ma", (_draw_moving_averages, _pdf_figsize("ma"),
+                        (symbol, prices, sma, ema), _REPORT_DPI)))
+                if len(rsi) > 0:
+                    chart_jobs.append((charts, "rsi", (_draw_rsi, _pdf_figsize("rsi"), (symbol, rsi), _REPORT_DPI)))
+                if len(macd) > 0:
+                    chart_jobs.append((charts, "macd", (_draw_macd, _pdf_figsize("macd"), (symbol, macd, signal), _REPORT_DPI)))
+                if len(sma) > 0:
+                    chart_jobs.append((charts, "bollinger", (_draw_bollinger_bands, _pdf_figsize("bollinger"),
+                        (symbol, prices, sma, upper_band, lower_band), _REPORT_DPI)))
             
             report_data[symbol] = stock_data
             
@@ -299,6 +351,20 @@ class StockVisualizer:
             print(f"Overall: {recommendation}")
             print("=" * 50)
         
+        # Render the charts. Drawing holds the GIL, so large batches go to worker
+        # processes; each worker must import matplotlib first, which costs more
+        # than rendering a handful of charts in this process.
+        jobs = [job for _, _, job in chart_jobs]
+        workers = min(4, os.cpu_count() or 1)
+        if workers > 1 and len(jobs) >= _PARALLEL_MIN_CHARTS:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pngs = list(executor.map(_render_chart_job, jobs))
+        else:
+            pngs = map(_render_chart_job, jobs)
+        for (charts, name, _), png in zip(chart_jobs, pngs):
+            # BytesIO shares the received bytes rather than copying them
+            charts[name] = io.BytesIO(png)
+        
         # If PDF output is requested, generate the PDF
         if output_pdf:
             self.create_pdf_report(report_data, output_pdf)
@@ -308,29 +374,42 @@ class StockVisualizer:
 
     def create_pdf_report(self, report_data, output_path):
         """Create a PDF report from the analysis data"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib import colors
+        
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         styles = getSampleStyleSheet()
+        title, h1, h2, h3, normal = (styles["Title"], styles["Heading1"], styles["Heading2"],
+                                     styles["Heading3"], styles["Normal"])
+        # Every indicator table has the same shape, so one style serves them all
+        table_style = TableStyle([
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ])
         elements = []
         
         # Add title
-        title_style = styles["Title"]
-        elements.append(Paragraph("Stock Market Analysis Report", title_style))
-        elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles["Normal"]))
+        elements.append(Paragraph("Stock Market Analysis Report", title))
+        elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal))
         elements.append(Spacer(1, 12))
         
         # Create a section for each stock
         for symbol, data in report_data.items():
             # Add stock title
-            elements.append(Paragraph(f"{symbol} Analysis", styles["Heading1"]))
+            elements.append(Paragraph(f"{symbol} Analysis", h1))
             elements.append(Spacer(1, 12))
             
             # Add price information
             price_text = f"Current Price: ₹{data['price']:.2f}" if data['price'] is not None else "Current Price: N/A"
-            elements.append(Paragraph(price_text, styles["Normal"]))
+            elements.append(Paragraph(price_text, normal))
             elements.append(Spacer(1, 12))
             
             # Add indicator analysis sections
-            elements.append(Paragraph("Technical Indicators", styles["Heading2"]))
+            elements.append(Paragraph("Technical Indicators", h2))
             
             # Create table for indicator data
             indicators_data = [
@@ -345,59 +424,56 @@ class StockVisualizer:
             ]
             
             t = Table(indicators_data, colWidths=[100, 150, 250])
-            t.setStyle(TableStyle([
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ]))
+            t.setStyle(table_style)
             elements.append(t)
             elements.append(Spacer(1, 12))
             
             # Add recommendation
-            elements.append(Paragraph("Recommendation:", styles["Heading3"]))
-            elements.append(Paragraph(data["recommendation"], styles["Normal"]))
+            elements.append(Paragraph("Recommendation:", h3))
+            elements.append(Paragraph(data["recommendation"], normal))
             elements.append(Spacer(1, 12))
             
             # Add charts if available
+            # Image wraps each in-memory chart in its own ImageReader as soon as it is
+            # created and draws from that reader, so every PNG is decoded only once
             if "charts" in data:
-                elements.append(Paragraph("Technical Charts", styles["Heading2"]))
+                elements.append(Paragraph("Technical Charts", h2))
                 elements.append(Spacer(1, 8))
                 
                 # Add Moving Averages chart
-                if data["charts"]["ma"]:
-                    elements.append(Paragraph("Moving Averages", styles["Heading3"]))
-                    elements.append(Image(data["charts"]["ma"], width=500, height=300))
+                if data["charts"].get("ma"):
+                    elements.append(Paragraph("Moving Averages", h3))
+                    elements.append(Image(data["charts"]["ma"], *_PDF_CHART_SIZES["ma"]))
                     elements.append(Spacer(1, 8))
                 
                 # Add RSI chart
-                if data["charts"]["rsi"]:
-                    elements.append(Paragraph("Relative Strength Index (RSI)", styles["Heading3"]))
-                    elements.append(Image(data["charts"]["rsi"], width=500, height=200))
+                if data["charts"].get("rsi"):
+                    elements.append(Paragraph("Relative Strength Index (RSI)", h3))
+                    elements.append(Image(data["charts"]["rsi"], *_PDF_CHART_SIZES["rsi"]))
                     elements.append(Spacer(1, 8))
                 
                 # Add MACD chart
-                if data["charts"]["macd"]:
-                    elements.append(Paragraph("MACD", styles["Heading3"]))
-                    elements.append(Image(data["charts"]["macd"], width=500, height=300))
+                if data["charts"].get("macd"):
+                    elements.append(Paragraph("MACD", h3))
+                    elements.append(Image(data["charts"]["macd"], *_PDF_CHART_SIZES["macd"]))
                     elements.append(Spacer(1, 8))
                 
                 # Add Bollinger Bands chart
-                if data["charts"]["bollinger"]:
-                    elements.append(Paragraph("Bollinger Bands", styles["Heading3"]))
-                    elements.append(Image(data["charts"]["bollinger"], width=500, height=300))
+                if data["charts"].get("bollinger"):
+                    elements.append(Paragraph("Bollinger Bands", h3))
+                    elements.append(Image(data["charts"]["bollinger"], *_PDF_CHART_SIZES["bollinger"]))
                     elements.append(Spacer(1, 8))
             
             # Add page break between stocks
             elements.append(Spacer(1, 20))
-            elements.append(Paragraph("_" * 65, styles["Normal"]))
+            elements.append(Paragraph("_" * 65, normal))
             elements.append(Spacer(1, 20))
         
         # Add disclaimer
-        elements.append(Paragraph("DISCLAIMER:", styles["Heading3"]))
+        elements.append(Paragraph("DISCLAIMER:", h3))
         elements.append(Paragraph("This report is for informational purposes only and does not constitute financial advice. "
                                  "Past performance is not indicative of future results. Always conduct your own research or "
-                                 "consult with a financial advisor before making investment decisions.", styles["Normal"]))
+                                 "consult with a financial advisor before making investment decisions.", normal))
         
         # Build PDF
         doc.build(elements)
\ No newline at end of file